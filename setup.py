@@ -5,8 +5,9 @@ setup(
     version='0.1.0',
     packages=find_packages(),
     install_requires=[
-        'snowflake-connector-python>=2.4.0',
+        'snowflake-connector-python>=3.0.0',
         'pandas>=1.1.0',
+        'pyarrow>=10.0.0',
         'cryptography>=3.2',
         'python-dotenv>=0.15.0',
     ],
@@ -1 +1 @@
-from .main import SnowflakeUtils, get_connection
+from .main import SnowflakeUtils, close_pooled_connections, get_connection
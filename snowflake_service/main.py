@@ -1,17 +1,302 @@
 import os
 import re
-import snowflake.connector
-import pandas as pd
+import atexit
+import queue
+import threading
+import math
+import mmap
+import tempfile
+import uuid
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional
-from snowflake.connector.pandas_tools import write_pandas
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Union
 from dotenv import load_dotenv
 import hashlib
 
+# pandas, pyarrow, cryptography and the Snowflake connector are imported where they are used,
+# so importing this module stays cheap for callers that never touch them
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
 load_dotenv()  # Load environment variables from .env file
 
+# Parquet file format for staged exports; logical types keep timestamp annotations such as UTC
+_EXPORT_FILE_FORMAT = "(TYPE = PARQUET USE_LOGICAL_TYPE = TRUE)"
+
+# Target uncompressed size of each Parquet shard staged by export_data
+_EXPORT_SHARD_BYTES = 256 * 1024 * 1024
+
+# Unquoted Snowflake identifiers, or double-quoted ones with "" escapes
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_$]*|"(?:[^"]|"")+"')
+
+# SQL variables in the form $var
+_VAR_RE = re.compile(r"\$(\w+)")
+
+# File formats supported for the local query cache
+_CACHE_FORMATS = ("feather", "parquet")
+
+# Rows buffered from the result stream before each cache row group is written
+_CACHE_ROW_GROUP_SIZE = 256_000
+
+# Statement types the connector cannot run inside a multi-statement request
+_SINGLE_STATEMENT_PREFIXES = ("put", "get")
+
+# Whitespace and comments preceding the first keyword of a statement
+_LEADING_COMMENTS_RE = re.compile(r"(?:\s+|--[^\n]*|/\*.*?\*/)*", re.DOTALL)
+
+# DER-encoded private keys keyed on (path, mtime_ns, passphrase digest), oldest first
+_DER_CACHE: Dict[tuple, bytes] = {}
+_DER_CACHE_MAXSIZE = 8
+_DER_CACHE_LOCK = threading.Lock()
+
+# Idle connections shared by SnowflakeUtils instances, keyed on connection parameters
+_POOL: Dict[tuple, queue.Queue] = {}
+_POOL_LOCK = threading.Lock()
+_POOL_MAXSIZE = 4  # Idle connections kept per key; extra ones are closed
+
+
+@functools.lru_cache(maxsize=None)
+def _arrow_to_snowflake_types() -> Dict:
+    """
+    Snowflake column types for non-parametric Arrow types, built on first use.
+    """
+    import pyarrow as pa
+
+    return {
+        pa.int8(): "NUMBER",
+        pa.int16(): "NUMBER",
+        pa.int32(): "NUMBER",
+        pa.int64(): "NUMBER",
+        pa.uint8(): "NUMBER",
+        pa.uint16(): "NUMBER",
+        pa.uint32(): "NUMBER",
+        pa.uint64(): "NUMBER",
+        pa.float16(): "FLOAT",
+        pa.float32(): "FLOAT",
+        pa.float64(): "FLOAT",
+        pa.bool_(): "BOOLEAN",
+        pa.date32(): "DATE",
+        pa.date64(): "DATE",
+        pa.string(): "STRING",
+        pa.large_string(): "STRING",
+        pa.binary(): "BINARY",
+        pa.large_binary(): "BINARY",
+    }
+
+
+def _clean_arrow(table: "pa.Table") -> "pa.Table":
+    """
+    Drop Snowflake metadata columns, lowercase column names and widen integer columns to int64.
+
+    Snowflake picks the narrowest integer width per result chunk, so without widening
+    consecutive batches of the same query could have different schemas.
+
+    Parameters:
+    - table: Arrow table or batch returned from Snowflake.
+
+    Returns:
+    - Cleaned Arrow table.
+
+    Examples:
+    >>> import pyarrow as pa
+    >>> first = pa.table({"ID": pa.array([1], pa.int8()), "_META": [0]})
+    >>> second = pa.table({"ID": pa.array([300], pa.int16()), "_META": [0]})
+    >>> cleaned = [_clean_arrow(batch) for batch in (first, second)]
+    >>> cleaned[0].schema == cleaned[1].schema
+    True
+    >>> pa.concat_tables(cleaned).column("id").to_pylist()
+    [1, 300]
+    """
+    import pyarrow as pa
+
+    names = table.schema.names
+    keep = [i for i, name in enumerate(names) if not name.startswith("_")]
+    table = table.select(keep).rename_columns([names[i].lower() for i in keep])
+    if any(pa.types.is_integer(field.type) for field in table.schema):
+        # Only the integer columns are converted; the others are passed through untouched
+        table = table.cast(
+            pa.schema(
+                field.with_type(pa.int64())
+                if pa.types.is_integer(field.type)
+                else field
+                for field in table.schema
+            )
+        )
+    return table
+
+
+def _empty_result_table(description) -> "pa.Table":
+    """
+    Build an empty, typed Arrow table from a cursor description.
+
+    fetch_arrow_batches yields nothing for empty results, so the column types are derived
+    from the Snowflake type codes in the description instead of from the data.
+
+    Parameters:
+    - description: The cursor description of the executed query.
+
+    Returns:
+    - Empty Arrow table with one column per result column.
+
+    Examples:
+    >>> _empty_result_table([("ID", 0, None, None, 38, 0, True), ("AMOUNT", 0, None, None, 10, 2, True),
+    ...                      ("CREATED", 8, None, None, 0, 9, True), ("NOTE", 2, None, None, None, None, True)]).schema
+    ID: int64
+    AMOUNT: double
+    CREATED: timestamp[ns]
+    NOTE: string
+    """
+    import pyarrow as pa
+
+    # Arrow types keyed on the Snowflake type code (FIXED with a scale is handled separately)
+    types = {
+        0: pa.int64(),  # FIXED
+        1: pa.float64(),  # REAL
+        3: pa.date32(),  # DATE
+        4: pa.timestamp("ns"),  # TIMESTAMP
+        6: pa.timestamp("ns", tz="UTC"),  # TIMESTAMP_LTZ
+        7: pa.timestamp("ns", tz="UTC"),  # TIMESTAMP_TZ
+        8: pa.timestamp("ns"),  # TIMESTAMP_NTZ
+        11: pa.binary(),  # BINARY
+        12: pa.time64("ns"),  # TIME
+        13: pa.bool_(),  # BOOLEAN
+    }
+    fields = []
+    for col in description:
+        name, type_code, scale = col[0], col[1], col[5]
+        if type_code == 0 and scale:
+            # The connector returns scaled numbers as doubles
+            fields.append(pa.field(name, pa.float64()))
+        else:
+            # Text, semi-structured and geospatial values arrive as strings
+            fields.append(pa.field(name, types.get(type_code, pa.string())))
+    return pa.schema(fields).empty_table()
+
+
+def _qualified_name(database: str, schema: str, table: str) -> str:
+    """
+    Validate the parts of a table name and join them into a fully-qualified name.
+
+    Parameters:
+    - database: Database name.
+    - schema: Schema name.
+    - table: Table name.
+
+    Returns:
+    - The name in the form database.schema.table.
+    """
+    for identifier in (database, schema, table):
+        if not _IDENTIFIER_RE.fullmatch(identifier):
+            raise ValueError(f"Invalid Snowflake identifier: {identifier!r}")
+    return f"{database}.{schema}.{table}"
+
+
+def _read_sql_file(path: Path) -> str:
+    """
+    Read a SQL file as UTF-8 through a read-only memory map.
+
+    Parameters:
+    - path: Path to the .sql file.
+
+    Returns:
+    - The file contents.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""  # Empty files cannot be memory-mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[:].decode("utf-8")
+
+
+def _iter_sql_statements(lines: Iterable[str]) -> Iterator[str]:
+    r"""
+    Split SQL text into statements as it is read, one line at a time.
+
+    Semicolons inside quoted strings, identifiers, comments and $$ blocks do not end a statement.
+    Statements made up only of comments and whitespace are skipped.
+
+    Parameters:
+    - lines: Lines of SQL text, e.g. an open file.
+
+    Returns:
+    - An iterator over the statements, stripped of surrounding whitespace.
+
+    Examples:
+    >>> list(_iter_sql_statements(["select 'a;b', 'it''s;', 'x\\';y';\n"]))
+    ["select 'a;b', 'it''s;', 'x\\';y'"]
+    >>> list(_iter_sql_statements(['select "we;ird" /* c;c */ from t;\n', "select 2"]))
+    ['select "we;ird" /* c;c */ from t', 'select 2']
+    >>> list(_iter_sql_statements(["as $$\n", "x; y;\n", "$$;\n"]))
+    ['as $$\nx; y;\n$$']
+    >>> list(_iter_sql_statements(["select 1 -- note\n", ";\n", "-- end\n"]))
+    ['select 1 -- note']
+    >>> list(_iter_sql_statements(["/* only */;\n", "-- a comment\n", "put x;\n"]))
+    ['-- a comment\nput x']
+    """
+    openers = {"'": "'", '"': '"', "--": "\n", "/*": "*/", "$$": "$$"}
+    statement = []
+    has_code = False  # Whether the current statement has anything besides comments
+    closer = None  # Delimiter ending the string, comment or $$ block we are inside
+    for line in lines:
+        start = i = 0
+        while i < len(line):
+            if closer is not None:
+                if closer == "'" and line[i] == "\\":
+                    i += 2  # Skip the escaped character
+                elif line.startswith(closer, i):
+                    i += len(closer)
+                    closer = None
+                else:
+                    i += 1
+                continue
+            if line[i] == ";":
+                statement.append(line[start:i])
+                if has_code:
+                    yield "".join(statement).strip()
+                statement = []
+                has_code = False
+                start = i = i + 1
+                continue
+            for opener in (line[i : i + 2], line[i]):
+                if opener in openers:
+                    closer = openers[opener]
+                    has_code = has_code or opener not in ("--", "/*")
+                    i += len(opener)
+                    break
+            else:
+                has_code = has_code or not line[i].isspace()
+                i += 1
+        statement.append(line[start:])
+    if has_code:
+        yield "".join(statement).strip()
+
+
+def _open_cache_writer(cache_file: Path, schema: "pa.Schema", cache_format: str):
+    """
+    Open a streaming writer for a query cache file.
+
+    Parameters:
+    - cache_file: Path of the cache file to write.
+    - schema: Arrow schema of the cached data.
+    - cache_format: Either "feather" (Arrow IPC, zstd) or "parquet".
+
+    Returns:
+    - A writer exposing write_table() and close().
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if cache_format == "parquet":
+        return pq.ParquetWriter(
+            cache_file, schema, compression="zstd", use_dictionary=True
+        )
+    options = pa.ipc.IpcWriteOptions(
+        compression=pa.Codec("zstd", compression_level=3)
+    )
+    return pa.ipc.new_file(cache_file, schema, options=options)
+
 
 def get_private_key_from_file(
     private_key_path: str, private_key_passphrase: Optional[str] = None
@@ -30,22 +315,70 @@ def get_private_key_from_file(
         print(f"Private key file not found at {private_key_path}")
         return None
 
-    with open(private_key_path, "rb") as key_file:
-        private_key_pem = key_file.read()
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.backends import default_backend
+
+    password = (
+        private_key_passphrase.encode() if private_key_passphrase is not None else None
+    )
+    # Reuse the DER bytes until the key file changes
+    cache_key = (
+        os.path.abspath(private_key_path),
+        os.stat(private_key_path).st_mtime_ns,
+        hashlib.blake2b(password).digest() if password is not None else None,
+    )
+    with _DER_CACHE_LOCK:
+        der = _DER_CACHE.get(cache_key)
+    if der is not None:
+        return der
+
+    # Read the small PEM file directly, without a buffered file object
+    fd = os.open(private_key_path, os.O_RDONLY)
+    try:
+        private_key_pem = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
 
     private_key = serialization.load_pem_private_key(
         private_key_pem,
-        password=private_key_passphrase.encode()
-        if private_key_passphrase is not None
-        else None,
+        password=password,
         backend=default_backend(),
     )
 
-    return private_key.private_bytes(
+    der = private_key.private_bytes(
         encoding=serialization.Encoding.DER,
         format=serialization.PrivateFormat.PKCS8,
         encryption_algorithm=serialization.NoEncryption(),
     )
+    with _DER_CACHE_LOCK:
+        # Forget keys loaded from an older version of this file, then evict the oldest entries
+        for key in [key for key in _DER_CACHE if key[0] == cache_key[0]]:
+            del _DER_CACHE[key]
+        while len(_DER_CACHE) >= _DER_CACHE_MAXSIZE:
+            del _DER_CACHE[next(iter(_DER_CACHE))]
+        _DER_CACHE[cache_key] = der
+    return der
+
+
+def _resolve_connection_params(
+    user, account, role, warehouse, database, schema, private_key_path, private_key_passphrase
+):
+    """
+    Fill in connection parameters that were not provided from environment variables.
+
+    Returns:
+    - Tuple of (user, account, role, warehouse, database, schema, private_key_path, private_key_passphrase).
+    """
+    return (
+        user or os.getenv("SNOWFLAKE_USER"),
+        account or os.getenv("SNOWFLAKE_ACCOUNT"),
+        role or os.getenv("SNOWFLAKE_ROLE"),
+        warehouse or os.getenv("SNOWFLAKE_WAREHOUSE"),
+        database or os.getenv("SNOWFLAKE_DATABASE"),
+        schema or os.getenv("SNOWFLAKE_SCHEMA"),
+        private_key_path or os.getenv("SNOWFLAKE_PRIVATE_KEY_PATH"),
+        private_key_passphrase or os.getenv("SNOWFLAKE_PRIVATE_KEY_PASSPHRASE"),
+    )
 
 
 def get_connection(
@@ -67,15 +400,39 @@ def get_connection(
     Returns:
     - A Snowflake connection object.
     """
-    user = user or os.getenv("SNOWFLAKE_USER")
-    account = account or os.getenv("SNOWFLAKE_ACCOUNT")
-    role = role or os.getenv("SNOWFLAKE_ROLE")
-    warehouse = warehouse or os.getenv("SNOWFLAKE_WAREHOUSE")
-    database = database or os.getenv("SNOWFLAKE_DATABASE")
-    schema = schema or os.getenv("SNOWFLAKE_SCHEMA")
-    private_key_path = private_key_path or os.getenv("SNOWFLAKE_PRIVATE_KEY_PATH")
-    private_key_passphrase = (
-        private_key_passphrase or os.getenv("SNOWFLAKE_PRIVATE_KEY_PASSPHRASE")
+    import snowflake.connector
+
+    (
+        user,
+        account,
+        role,
+        warehouse,
+        database,
+        schema,
+        private_key_path,
+        private_key_passphrase,
+    ) = _resolve_connection_params(
+        user,
+        account,
+        role,
+        warehouse,
+        database,
+        schema,
+        private_key_path,
+        private_key_passphrase,
+    )
+
+    connect_args = dict(
+        user=user,
+        account=account,
+        role=role,
+        warehouse=warehouse,
+        database=database,
+        schema=schema,
+        # Download result chunks in parallel and decode them as Arrow batches
+        client_prefetch_threads=8,
+        client_session_keep_alive=True,
+        session_parameters={"QUERY_RESULT_FORMAT": "ARROW"},
     )
 
     if private_key_path and os.path.exists(private_key_path):
@@ -84,29 +441,124 @@ def get_connection(
         )
 
         print("Using private key to log in to Snowflake.")
-        conn = snowflake.connector.connect(
-            user=user,
-            account=account,
-            role=role,
-            warehouse=warehouse,
-            database=database,
-            schema=schema,
-            private_key=private_key,
-        )
+        conn = snowflake.connector.connect(**connect_args, private_key=private_key)
     else:
         print("Using browser authentication, no private key found. Please log in to Snowflake.")
         conn = snowflake.connector.connect(
-            user=user,
-            account=account,
-            role=role,
-            warehouse=warehouse,
-            database=database,
-            schema=schema,
-            authenticator="externalbrowser",
+            **connect_args, authenticator="externalbrowser"
         )
     return conn
 
 
+def _acquire_pooled_connection(key: tuple):
+    """
+    Take an open idle connection for the given parameters from the pool, if there is one.
+
+    The session is reset to the role, warehouse, database and schema in the key before it is handed out.
+
+    Parameters:
+    - key: Connection parameters identifying the pool.
+
+    Returns:
+    - A Snowflake connection object, or None.
+    """
+    with _POOL_LOCK:
+        idle = _POOL.get(key)
+    while idle is not None:
+        try:
+            conn = idle.get_nowait()
+        except queue.Empty:
+            return None
+        if conn.is_closed():
+            continue
+        try:
+            _reset_session(conn, key)
+        except Exception:
+            # A session that cannot be reset is discarded rather than reused
+            conn.close()
+            continue
+        return conn
+    return None
+
+
+def _session_identifiers(key: tuple) -> Optional[list]:
+    """
+    List the role, warehouse, database and schema a pooled session must be reset to.
+
+    Parameters:
+    - key: Connection parameters identifying the pool.
+
+    Returns:
+    - (kind, name) pairs for the parameters that are set, or None if any of them is not a valid identifier.
+    """
+    _, _, role, warehouse, database, schema, _ = key
+    identifiers = [
+        (kind, name)
+        for kind, name in (
+            ("ROLE", role),
+            ("WAREHOUSE", warehouse),
+            ("DATABASE", database),
+            ("SCHEMA", schema),
+        )
+        if name
+    ]
+    if not all(_IDENTIFIER_RE.fullmatch(name) for _, name in identifiers):
+        return None
+    return identifiers
+
+
+def _reset_session(conn, key: tuple):
+    """
+    Roll back any open transaction and restore the role, warehouse, database and schema from the pool key.
+
+    Parameters:
+    - conn: The Snowflake connection taken from the pool.
+    - key: Connection parameters identifying the pool.
+    """
+    statements = ["ROLLBACK"] + [
+        f"USE {kind} {name}" for kind, name in _session_identifiers(key)
+    ]
+    cursor = conn.cursor()
+    try:
+        # One multi-statement request keeps the reset to a single round-trip
+        cursor.execute(";\n".join(statements), num_statements=len(statements))
+    finally:
+        cursor.close()
+
+
+def _release_pooled_connection(key: tuple, conn):
+    """
+    Return a connection to the pool so another SnowflakeUtils instance can reuse it.
+
+    Parameters:
+    - key: Connection parameters identifying the pool.
+    - conn: The Snowflake connection to return.
+    """
+    with _POOL_LOCK:
+        idle = _POOL.setdefault(key, queue.Queue(maxsize=_POOL_MAXSIZE))
+    try:
+        idle.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def close_pooled_connections():
+    """Close every idle connection held in the pool."""
+    with _POOL_LOCK:
+        pools = list(_POOL.values())
+        _POOL.clear()
+    for idle in pools:
+        while True:
+            try:
+                conn = idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+atexit.register(close_pooled_connections)
+
+
 class SnowflakeUtils:
     """Utility class for connecting to Snowflake and executing queries."""
 
@@ -121,7 +573,7 @@ class SnowflakeUtils:
         private_key_path=None,
         private_key_passphrase=None,
     ):
-        self.conn = get_connection(
+        params = _resolve_connection_params(
             user,
             account,
             role,
@@ -131,15 +583,33 @@ class SnowflakeUtils:
             private_key_path,
             private_key_passphrase,
         )
+        # Instances with the same parameters share connections; the passphrase is not part of the key
+        self._pool_key = params[:-1]
+        # Sessions can only be reset safely when every name in the key is a valid identifier
+        poolable = _session_identifiers(self._pool_key) is not None
+        self.conn = (
+            poolable and _acquire_pooled_connection(self._pool_key)
+        ) or get_connection(*params)
+        # Cleared once arbitrary SQL may have changed session state (ALTER SESSION, USE, ...)
+        self._reusable = poolable
 
     def close(self):
-        """Close the Snowflake connection."""
+        """Return the Snowflake connection to the shared pool for reuse, or close it if its session was altered."""
         if self.conn:
-            self.conn.close()
+            if self._reusable:
+                _release_pooled_connection(self._pool_key, self.conn)
+            else:
+                self.conn.close()
+            self.conn = None
 
     def fetch_data(
-        self, query_input: str, variables: Dict = {}, cache: bool = True
-    ) -> pd.DataFrame:
+        self,
+        query_input: str,
+        variables: Dict = {},
+        cache: bool = True,
+        return_pandas: bool = True,
+        cache_format: str = "feather",
+    ) -> Union["pd.DataFrame", "pa.Table"]:
         """
         Fetch data from Snowflake, with optional caching and variable substitution.
 
@@ -147,10 +617,19 @@ class SnowflakeUtils:
         - query_input: SQL query string or path to a .sql file.
         - variables: Dictionary of variables to substitute in the query.
         - cache: Whether to use cached results if available.
+        - return_pandas: Return a Pandas DataFrame, or an Arrow table if False.
+        - cache_format: Cache file format, "feather" (default) or "parquet".
 
         Returns:
-        - A Pandas DataFrame containing the query results.
+        - A Pandas DataFrame (or Arrow table) containing the query results.
         """
+        import pyarrow as pa
+
+        if cache_format not in _CACHE_FORMATS:
+            raise ValueError(
+                f"cache_format must be one of {', '.join(_CACHE_FORMATS)}"
+            )
+
         print("Fetching data from Snowflake...")
 
         # Define cache directory
@@ -171,10 +650,10 @@ class SnowflakeUtils:
                 raise FileNotFoundError(f"File {query_input} not found")
 
             # Read the query from the file
-            query = query_file.read_text()
+            query = _read_sql_file(query_file)
 
             # Set cache filename based on the input filename
-            cache_file = cache_dir / query_file.with_suffix(".parquet").name
+            cache_file = cache_dir / query_file.with_suffix(f".{cache_format}").name
 
         else:
             query = query_input.strip()
@@ -184,64 +663,131 @@ class SnowflakeUtils:
                     "The input must be a filename ending with '.sql' or a SQL query starting with 'select' or 'with'"
                 )
             # Set a unique cache filename based on the query hash
-            query_hash = hashlib.md5(query.encode('utf-8')).hexdigest()
-            cache_file = cache_dir / f"{query_hash}.parquet"
+            query_hash = hashlib.blake2b(
+                query.encode("utf-8"), digest_size=16
+            ).hexdigest()
+            cache_file = cache_dir / f"{query_hash}.{cache_format}"
 
         # Use cached data if available
         if cache and cache_file.exists():
-            return pd.read_parquet(cache_file)
+            return self.read_cache(cache_file, return_pandas)
 
         # Format the query with the provided variables
-        query = self.format_variables(query)
-        query = query.format(**variables)
+        query = self.substitute_variables(query, variables)
+
+        if is_file:
+            # .sql files may change the session, so this connection is not returned to the pool
+            self._reusable = False
 
         # Execute the query
         cursor = self.conn.cursor()
         try:
             print(f"Executing query:\n{query}")
             cursor.execute(query)
-            df = self.convert_snowflake_response(cursor.fetch_pandas_all())
-            # Save to cache
-            df.to_parquet(cache_file, index=False)
-            return df
+            # Stream result batches into a partial file, renamed once the fetch completes
+            partial_file = cache_file.with_name(cache_file.name + ".part")
+            writer = None
+            pending, pending_rows = [], 0
+
+            def write_pending():
+                table = pa.concat_tables(pending)
+                if cache_format == "feather":
+                    # The IPC writer emits one record batch per chunk, so merge them first
+                    table = table.combine_chunks()
+                writer.write_table(table)
+
+            try:
+                for batch in cursor.fetch_arrow_batches():
+                    batch = _clean_arrow(batch)
+                    if writer is None:
+                        writer = _open_cache_writer(
+                            partial_file, batch.schema, cache_format
+                        )
+                    # Coalesce the small result chunks into large row groups
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    if pending_rows >= _CACHE_ROW_GROUP_SIZE:
+                        write_pending()
+                        pending, pending_rows = [], 0
+                if pending:
+                    write_pending()
+                    pending = []
+                if writer is None:
+                    # Empty result: cache an empty table typed from the cursor description
+                    empty = _clean_arrow(_empty_result_table(cursor.description))
+                    writer = _open_cache_writer(
+                        partial_file, empty.schema, cache_format
+                    )
+                    writer.write_table(empty)
+                writer.close()
+                writer = None
+                partial_file.replace(cache_file)
+            except BaseException:
+                # Do not leave a partially written cache behind
+                if writer is not None:
+                    writer.close()
+                if partial_file.exists():
+                    partial_file.unlink()
+                raise
         finally:
             cursor.close()
 
-    def convert_snowflake_response(self, response: pd.DataFrame) -> pd.DataFrame:
+        return self.read_cache(cache_file, return_pandas)
+
+    def read_cache(
+        self, cache_file: Path, return_pandas: bool = True
+    ) -> Union["pd.DataFrame", "pa.Table"]:
         """
-        Clean the Snowflake response DataFrame by removing metadata columns and normalizing column names.
+        Read a cached query result.
 
         Parameters:
-        - response: The DataFrame returned from Snowflake.
+        - cache_file: Path to a .feather or .parquet cache file.
+        - return_pandas: Return a Pandas DataFrame, or an Arrow table if False.
 
         Returns:
-        - Cleaned DataFrame.
+        - The cached query results.
         """
-        # Remove metadata columns
-        response = response.loc[:, ~response.columns.str.startswith("_")]
-        # Normalize column names
-        response.columns = [x.lower() for x in response.columns]
-        return response
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
 
-    def format_variables(self, query: str) -> str:
+        if cache_file.suffix == ".parquet":
+            table = pq.read_table(cache_file)
+        else:
+            table = feather.read_table(cache_file)
+        if return_pandas:
+            # Release each Arrow column as soon as it has been converted
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        return table
+
+    def substitute_variables(self, query: str, variables: Dict) -> str:
         """
-        Replace SQL variables in the form $var with Python format placeholders.
+        Replace SQL variables in the form $var with their values in a single pass.
+
+        Variables missing from the dictionary are left untouched.
 
         Parameters:
         - query: The SQL query string.
+        - variables: Dictionary of variable values.
 
         Returns:
-        - Formatted query string.
+        - Query string with the variables substituted.
         """
-        return re.sub(r"\$(\w+)", r"{\1}", query)
+        return _VAR_RE.sub(
+            lambda m: str(variables[m.group(1)])
+            if m.group(1) in variables
+            else m.group(0),
+            query,
+        )
 
     def export_data(
         self,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         database: str,
         schema: str,
         table: str,
         append: bool = True,
+        parallel: int = 16,
+        chunk_size: Optional[int] = None,
     ):
         """
         Export a Pandas DataFrame to a Snowflake table.
@@ -252,7 +798,12 @@ class SnowflakeUtils:
         - schema: Target schema in Snowflake.
         - table: Target table in Snowflake.
         - append: Whether to append to the table if it exists.
+        - parallel: Number of threads used to upload each staged file.
+        - chunk_size: Rows per staged Parquet file; by default files are sized to ~256MB.
         """
+        # Fully qualify every identifier so no USE DATABASE/SCHEMA round-trips are needed
+        table_name = _qualified_name(database, schema, table)
+
         if not append:
             self.drop_table(database, schema, table)
 
@@ -260,74 +811,158 @@ class SnowflakeUtils:
             print("DataFrame is empty. No data to export.")
             return
 
+        import pyarrow as pa
+
         # Convert column names to uppercase
         df.columns = [col.upper() for col in df.columns]
 
-        # Set the database and schema
-        self.conn.cursor().execute(f"USE DATABASE {database}")
-        self.conn.cursor().execute(f"USE SCHEMA {schema}")
+        # Convert once; the Arrow schema drives the DDL and the table is staged as Parquet
+        arrow_table = pa.Table.from_pandas(df, preserve_index=False)
 
         cursor = self.conn.cursor()
-
-        # Check if the table exists
-        cursor.execute(
-            f"""
-            SELECT COUNT(*)
-            FROM information_schema.tables
-            WHERE table_schema = '{schema}' AND table_name = '{table.upper()}'
-            """
-        )
-        table_exists = cursor.fetchone()[0]
-
-        # Create table if it doesn't exist
-        if table_exists == 0:
+        try:
+            # Create table if it doesn't exist
             column_defs = ", ".join(
-                [
-                    f"{col} {self.pandas_type_to_snowflake(df[col].dtype)}"
-                    for col in df.columns
-                ]
+                f"{field.name} {self.arrow_type_to_snowflake(field.type)}"
+                for field in arrow_table.schema
             )
             create_table_sql = f"""
-            CREATE TABLE {schema}.{table} (
+            CREATE TABLE IF NOT EXISTS {table_name} (
                 {column_defs}
             )
             """
             print("Generated SQL for table creation:\n", create_table_sql)
             cursor.execute(create_table_sql)
-            print(f"Table '{table}' created successfully.")
-        else:
-            print(f"Table '{table}' already exists.")
+            # Snowflake reports whether the table was created or already existed
+            print(cursor.fetchone()[0])
 
-        print(f"Writing {len(df)} rows to Snowflake...")
+            print(f"Writing {len(df)} rows to Snowflake...")
 
-        # Write the DataFrame to the Snowflake table
-        success, _, nrows, _ = write_pandas(self.conn, df, table_name=table)
+            # Write the DataFrame as Parquet shards, upload them to a temporary stage and bulk load with COPY
+            nrows = self.copy_table_into(
+                cursor, arrow_table, database, schema, table, parallel, chunk_size
+            )
+        finally:
+            cursor.close()
 
-        if success:
-            print(f"Successfully written {nrows} rows to Snowflake.")
-        else:
-            print("Failed to write DataFrame to Snowflake.")
+        print(f"Successfully written {nrows} rows to Snowflake.")
 
-    def pandas_type_to_snowflake(self, dtype) -> str:
+    def copy_table_into(
+        self,
+        cursor,
+        arrow_table: "pa.Table",
+        database: str,
+        schema: str,
+        table: str,
+        parallel: int = 16,
+        chunk_size: Optional[int] = None,
+    ) -> int:
         """
-        Map Pandas data types to Snowflake data types.
+        Bulk load an Arrow table into an existing Snowflake table through a temporary stage.
+
+        The data is split into Parquet shards which are written on worker threads
+        and uploaded with PUT as soon as each one is ready, then loaded with a single COPY INTO.
 
         Parameters:
-        - dtype: The data type of the Pandas column.
+        - cursor: Cursor to run the stage, PUT and COPY statements on.
+        - arrow_table: Arrow table to load.
+        - database: Target database in Snowflake.
+        - schema: Target schema in Snowflake.
+        - table: Target table in Snowflake.
+        - parallel: Number of threads used to upload each staged file.
+        - chunk_size: Rows per staged Parquet file; by default files are sized to ~256MB.
+
+        Returns:
+        - Number of rows loaded.
+        """
+        import pyarrow.parquet as pq
+
+        rows_per_shard = chunk_size or max(
+            1,
+            math.ceil(
+                arrow_table.num_rows
+                * _EXPORT_SHARD_BYTES
+                / max(arrow_table.nbytes, 1)
+            ),
+        )
+        table_name = _qualified_name(database, schema, table)
+        stage = f"{database}.{schema}.export_stage_{uuid.uuid4().hex}"
+
+        def write_shard(offset: int, path: Path) -> Path:
+            pq.write_table(
+                arrow_table.slice(offset, rows_per_shard),
+                path,
+                compression="snappy",
+                coerce_timestamps="us",
+                allow_truncated_timestamps=True,
+            )
+            return path
+
+        cursor.execute(
+            f"CREATE TEMPORARY STAGE {stage} FILE_FORMAT = {_EXPORT_FILE_FORMAT}"
+        )
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir, ThreadPoolExecutor() as pool:
+                shards = [
+                    pool.submit(write_shard, offset, Path(tmp_dir) / f"part_{i}.parquet")
+                    for i, offset in enumerate(
+                        range(0, arrow_table.num_rows, rows_per_shard)
+                    )
+                ]
+                # Upload each shard as soon as it has been written
+                for shard in as_completed(shards):
+                    path = shard.result().as_posix().replace("'", "\\'")
+                    cursor.execute(
+                        f"PUT 'file://{path}' @{stage} AUTO_COMPRESS=FALSE PARALLEL={parallel}"
+                    )
+
+            cursor.execute(
+                f"""
+                COPY INTO {table_name}
+                FROM @{stage}
+                FILE_FORMAT = {_EXPORT_FILE_FORMAT}
+                MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+                PURGE = TRUE
+                """
+            )
+            # COPY returns one row per loaded file; the fourth column is rows_loaded
+            return sum(row[3] for row in cursor.fetchall())
+        finally:
+            cursor.execute(f"DROP STAGE IF EXISTS {stage}")
+
+    def arrow_type_to_snowflake(self, arrow_type: "pa.DataType") -> str:
+        """
+        Map Arrow data types to Snowflake data types.
+
+        Parameters:
+        - arrow_type: The Arrow data type of the column.
 
         Returns:
         - Corresponding Snowflake data type as a string.
         """
-        if pd.api.types.is_integer_dtype(dtype):
-            return "NUMBER"
-        elif pd.api.types.is_float_dtype(dtype):
-            return "FLOAT"
-        elif pd.api.types.is_datetime64_any_dtype(dtype):
-            return "TIMESTAMP_NTZ"
-        elif pd.api.types.is_bool_dtype(dtype):
-            return "BOOLEAN"
-        else:
-            return "STRING"
+        import pyarrow as pa
+
+        known_types = _arrow_to_snowflake_types()
+        if arrow_type in known_types:
+            return known_types[arrow_type]
+        if pa.types.is_timestamp(arrow_type):
+            return "TIMESTAMP_TZ" if arrow_type.tz else "TIMESTAMP_NTZ"
+        if pa.types.is_decimal(arrow_type):
+            # Precision inferred from one DataFrame is too narrow for later appends, so use the maximum
+            return f"NUMBER(38,{min(arrow_type.scale, 37)})"
+        if pa.types.is_time(arrow_type):
+            return "TIME"
+        if pa.types.is_dictionary(arrow_type):
+            return self.arrow_type_to_snowflake(arrow_type.value_type)
+        if (
+            pa.types.is_list(arrow_type)
+            or pa.types.is_large_list(arrow_type)
+            or pa.types.is_fixed_size_list(arrow_type)
+        ):
+            return "ARRAY"
+        if pa.types.is_struct(arrow_type) or pa.types.is_map(arrow_type):
+            return "OBJECT"
+        return "STRING"
 
     def drop_table(self, database: str, schema: str, table: str):
         """
@@ -338,51 +973,127 @@ class SnowflakeUtils:
         - schema: Target schema in Snowflake.
         - table: Target table in Snowflake.
         """
-        # Set the database and schema
-        self.conn.cursor().execute(f"USE DATABASE {database}")
-        self.conn.cursor().execute(f"USE SCHEMA {schema}")
-
         cursor = self.conn.cursor()
-        # Check if the table exists
-        cursor.execute(
-            f"""
-            SELECT COUNT(*)
-            FROM information_schema.tables
-            WHERE table_schema = '{schema}' AND table_name = '{table.upper()}'
-            """
-        )
-        table_exists = cursor.fetchone()[0]
-
-        if table_exists != 0:
-            cursor.execute(f"DROP TABLE {schema}.{table}")
-            print(f"Table '{table}' dropped.")
-        else:
-            print(f"Table '{table}' does not exist.")
+        try:
+            cursor.execute(
+                f"DROP TABLE IF EXISTS {_qualified_name(database, schema, table)}"
+            )
+            # Snowflake reports whether the table was dropped or did not exist
+            print(cursor.fetchone()[0])
+        finally:
+            cursor.close()
 
-    def execute_sql(self, file_path: str, variables: Dict = {}):
+    def execute_sql(self, file_path: str, variables: Dict = {}, batch_size: int = 50):
         """
         Execute SQL commands from a file, with optional variable substitution.
 
+        Commands are submitted to Snowflake in multi-statement batches to save round-trips.
+
         Parameters:
         - file_path: Path to the .sql file.
         - variables: Dictionary of variables to substitute in the SQL.
+        - batch_size: Maximum number of commands submitted in a single request.
         """
-        # Read the SQL file
-        with open(file_path, "r") as file:
-            sql_commands = file.read()
+        # .sql files may change the session, so this connection is not returned to the pool
+        self._reusable = False
 
-        # Replace variables
-        sql_commands = self.format_variables(sql_commands)
-        sql_commands = sql_commands.format(**variables)
+        cursor = self.conn.cursor()
+        batch = []  # (command number, command) pairs waiting to be submitted
 
-        # Split SQL commands
-        sql_commands_list = sql_commands.strip().split(";")
+        def submit(entries):
+            for number, command in entries:
+                print(f"Executing SQL command {number}:\n{command}")
+            try:
+                if len(entries) == 1:
+                    cursor.execute(entries[0][1])
+                else:
+                    # Separators go on their own line so a trailing -- comment cannot swallow them
+                    cursor.execute(
+                        "\n;\n".join(command for _, command in entries),
+                        num_statements=len(entries),
+                    )
+            except Exception:
+                first, last = entries[0][0], entries[-1][0]
+                where = f"command {first}" if first == last else f"commands {first}-{last}"
+                print(f"Failed executing SQL {where} from {file_path}")
+                raise
 
-        cursor = self.conn.cursor()
-        # Execute each command
-        for command in sql_commands_list:
-            command = command.strip()
-            if command:  # Only execute non-empty commands
-                print(f"Executing SQL command:\n{command}")
-                cursor.execute(command)
-        cursor.close()
\ No newline at end of file
+        def flush():
+            if batch:
+                submit(batch)
+                batch.clear()
+
+        try:
+            with open(file_path, "r") as file:
+                for number, command in enumerate(_iter_sql_statements(file), start=1):
+                    # Replace variables
+                    command = self.substitute_variables(command, variables)
+
+                    keyword_start = _LEADING_COMMENTS_RE.match(command).end()
+                    if command[keyword_start:].lower().startswith(
+                        _SINGLE_STATEMENT_PREFIXES
+                    ):
+                        flush()
+                        submit([(number, command)])
+                        continue
+                    batch.append((number, command))
+                    if len(batch) >= batch_size:
+                        flush()
+            flush()
+        finally:
+            cursor.close()
+
+    # Kept for backward compatibility with existing callers; nothing in this module uses them.
+    # fetch_data cleans results with _clean_arrow, queries use substitute_variables and
+    # export_data derives column types with arrow_type_to_snowflake.
+
+    def convert_snowflake_response(self, response: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Clean the Snowflake response DataFrame by removing metadata columns and normalizing column names.
+
+        Parameters:
+        - response: The DataFrame returned from Snowflake.
+
+        Returns:
+        - Cleaned DataFrame.
+        """
+        # Remove metadata columns
+        response = response.loc[:, ~response.columns.str.startswith("_")]
+        # Normalize column names
+        response.columns = [x.lower() for x in response.columns]
+        return response
+
+    def format_variables(self, query: str) -> str:
+        """
+        Replace SQL variables in the form $var with Python format placeholders.
+
+        Parameters:
+        - query: The SQL query string.
+
+        Returns:
+        - Formatted query string.
+        """
+        return _VAR_RE.sub(r"{\1}", query)
+
+    def pandas_type_to_snowflake(self, dtype) -> str:
+        """
+        Map Pandas data types to Snowflake data types.
+
+        Parameters:
+        - dtype: The data type of the Pandas column.
+
+        Returns:
+        - Corresponding Snowflake data type as a string.
+        """
+        import pandas as pd
+
+        if pd.api.types.is_integer_dtype(dtype):
+            return "NUMBER"
+        elif pd.api.types.is_float_dtype(dtype):
+            return "FLOAT"
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            return "TIMESTAMP_NTZ"
+        elif pd.api.types.is_bool_dtype(dtype):
+            return "BOOLEAN"
+        else:
+            return "STRING"